@@ -14,9 +14,16 @@ import numpy as np
 import math
 import os
 import argparse
-from typing import Dict, Tuple, Optional
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
+import warnings
+from typing import TYPE_CHECKING, Dict, Tuple, Optional
+
+# matplotlib is imported inside the plotting functions so that runs without
+# plots do not pay for loading it
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Directory of this script, where plots are saved
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ============================================================
 # CONFIGURATION - EDIT THESE VALUES
@@ -43,11 +50,117 @@ GENERATE_PLOTS = True    # Set to False to disable plot generation
 # CORE FUNCTIONS
 # ============================================================
 
+def _credible_interval(samples: np.ndarray, in_place: bool = False) -> Tuple[float, float]:
+    """
+    Return the 2.5th and 97.5th order statistics of the samples.
+    
+    Uses a partial sort, which is linear in the number of samples, rather
+    than the full sort done by np.percentile.
+    
+    Args:
+        samples: One-dimensional array of samples
+        in_place: Partition the array in place instead of a copy
+        
+    Returns:
+        Tuple of (lower, upper) bounds
+    """
+    k_lo = int(0.025 * samples.size)
+    k_hi = int(0.975 * samples.size)
+    if in_place:
+        samples.partition([k_lo, k_hi])
+        part = samples
+    else:
+        part = np.partition(samples, [k_lo, k_hi])
+    return part[k_lo], part[k_hi]
+
+
+# The closed-form expected loss sums a_alpha terms, so it is only used up to
+# this many; larger posteriors fall back to the Monte Carlo estimate
+_EXACT_LOSS_MAX_ALPHA = 5_000
+
+
+def _lgamma_sequence(x: float, n: int) -> np.ndarray:
+    """Return lgamma(x + i) for i = 0..n-1 using the recurrence Γ(x+1) = xΓ(x)"""
+    steps = np.log(x + np.arange(n - 1))
+    return math.lgamma(x) + np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def _prob_beta_greater(a1: int, b1: float, a2: float, b2: float) -> float:
+    """
+    Exact probability that Beta(a1, b1) exceeds an independent Beta(a2, b2).
+    
+    Uses the closed form for an integer first alpha, summed in log space:
+    sum over i < a1 of B(a2+i, b1+b2) / ((b1+i) B(1+i, b1) B(a2, b2)).
+    """
+    a1 = int(a1)
+    i = np.arange(a1)
+    log_terms = (
+        _lgamma_sequence(a2, a1) + math.lgamma(b1 + b2) - _lgamma_sequence(a2 + b1 + b2, a1)
+        - np.log(b1 + i)
+        - (_lgamma_sequence(1, a1) + math.lgamma(b1) - _lgamma_sequence(1 + b1, a1))
+        - (math.lgamma(a2) + math.lgamma(b2) - math.lgamma(a2 + b2))
+    )
+    log_max = log_terms.max()
+    return math.exp(log_max) * np.exp(log_terms - log_max).sum()
+
+
+def expected_loss_beta(a_alpha: int, a_beta: float,
+                       b_alpha: float, b_beta: float) -> float:
+    """
+    Exact expected loss E[max(A - B, 0)] of choosing B over A.
+    
+    A ~ Beta(a_alpha, a_beta) and B ~ Beta(b_alpha, b_beta) are independent.
+    The expectation splits into E[A; A > B] - E[B; A > B], and each part is a
+    posterior mean times a probability that one Beta exceeds another. Time and
+    memory grow linearly with a_alpha.
+    
+    Args:
+        a_alpha: Alpha parameter of the posterior for group A (an integer)
+        a_beta: Beta parameter of the posterior for group A
+        b_alpha: Alpha parameter of the posterior for group B
+        b_beta: Beta parameter of the posterior for group B
+        
+    Returns:
+        Expected loss as a proportion
+    """
+    a_mean = a_alpha / (a_alpha + a_beta)
+    b_mean = b_alpha / (b_alpha + b_beta)
+    return (a_mean * _prob_beta_greater(a_alpha + 1, a_beta, b_alpha, b_beta)
+            - b_mean * _prob_beta_greater(a_alpha, a_beta, b_alpha + 1, b_beta))
+
+
+def _guard_small_alpha(a_alpha: float, a_samples: np.ndarray, source: str) -> None:
+    """
+    Warn about and floor group A's draws when its posterior alpha is <= 1.
+    
+    With alpha <= 1 the posterior of A piles up at zero, so 1/A has no finite
+    mean and draws can underflow to exactly zero in single precision. The
+    draws are floored in place so the relative uplift stays finite. source
+    names the calling step in the warning.
+    """
+    if a_alpha <= 1:
+        warnings.warn(
+            f"Group A's posterior alpha is <= 1 in the {source}; the relative "
+            "uplift has no finite mean and its estimate will be unstable",
+            RuntimeWarning,
+            stacklevel=2
+        )
+        np.maximum(a_samples, np.finfo(np.float32).tiny, out=a_samples)
+
+
+def _posterior_parameters(successes: int, total: int,
+                          alpha_prior: float = 1,
+                          beta_prior: float = 1) -> Tuple[float, float]:
+    """Return the (alpha, beta) parameters of one group's Beta posterior"""
+    return successes + alpha_prior, total - successes + beta_prior
+
+
 def run_simulation(a_successes: int, a_total: int, 
                   b_successes: int, b_total: int,
                   n_simulations: int = 100_000, 
                   alpha_prior: float = 1, 
-                  beta_prior: float = 1) -> Dict:
+                  beta_prior: float = 1,
+                  rng: Optional[np.random.Generator] = None) -> Dict:
     """
     Run Bayesian A/B test simulation and return results.
     
@@ -59,48 +172,70 @@ def run_simulation(a_successes: int, a_total: int,
         n_simulations: Number of Monte Carlo simulations
         alpha_prior: Alpha parameter for Beta prior
         beta_prior: Beta parameter for Beta prior
+        rng: Random generator to draw from (a fresh unseeded one if omitted)
         
     Returns:
         Dictionary with simulation results
     """
+    if rng is None:
+        rng = np.random.default_rng()
+    
     # Posterior parameters (Beta distribution)
-    a_alpha = a_successes + alpha_prior
-    a_beta = a_total - a_successes + beta_prior
+    a_alpha, a_beta = _posterior_parameters(a_successes, a_total, alpha_prior, beta_prior)
+    b_alpha, b_beta = _posterior_parameters(b_successes, b_total, alpha_prior, beta_prior)
 
-    b_alpha = b_successes + alpha_prior
-    b_beta = b_total - b_successes + beta_prior
-
-    # Simulate posterior distributions
-    a_samples = np.random.beta(a_alpha, a_beta, n_simulations)
-    b_samples = np.random.beta(b_alpha, b_beta, n_simulations)
+    # Simulate posterior distributions. Single precision is plenty: its ~1e-7
+    # relative rounding error is far below the ~1e-3 Monte Carlo error of the
+    # percentiles, and it halves the memory traffic of every later pass.
+    # Generator.beta only produces float64, so as in _BayesianSampler each Beta
+    # variate is a ratio of float32 Gamma variates. Both groups are drawn
+    # together, one row per group so each stays contiguous.
+    samples = rng.standard_gamma([[a_alpha], [b_alpha]], size=(2, n_simulations), dtype=np.float32)
+    scratch = rng.standard_gamma([[a_beta], [b_beta]], size=(2, n_simulations), dtype=np.float32)
+    np.add(samples, scratch, out=scratch)
+    np.divide(samples, scratch, out=samples)
+    del scratch
+    a_samples, b_samples = samples
+    
+    _guard_small_alpha(a_alpha, a_samples, "simulation")
 
+    # Every summary below is derived from the one difference array, which is
+    # not returned and so is reused as scratch space once the uplift is known
+    absolute_diff = np.subtract(b_samples, a_samples)
+    relative_uplift = np.divide(absolute_diff, a_samples)
+    
     # Absolute difference
-    absolute_diff = b_samples - a_samples
     abs_mean = np.mean(absolute_diff) * 100
-    abs_ci = np.percentile(absolute_diff * 100, [2.5, 97.5])
+    abs_ci_lower, abs_ci_upper = _credible_interval(absolute_diff, in_place=True)
     
     # Relative uplift
-    relative_uplift = (b_samples - a_samples) / a_samples
     mean_uplift = np.mean(relative_uplift) * 100
-    ci = np.percentile(relative_uplift * 100, [2.5, 97.5])
-    ci_width = ci[1] - ci[0]
+    ci_lower, ci_upper = _credible_interval(relative_uplift)
+    ci_lower *= 100
+    ci_upper *= 100
+    ci_width = ci_upper - ci_lower
     
     # Probability B is better
-    prob_b_better = np.mean(b_samples > a_samples)
+    prob_b_better = np.count_nonzero(absolute_diff > 0) / n_simulations
     
-    # Expected loss calculations (opportunity cost)
-    expected_loss = np.mean(np.maximum(a_samples - b_samples, 0))
+    # Expected loss calculations (opportunity cost), exact when the closed
+    # form applies and is cheap, and estimated from the samples otherwise
+    if float(a_alpha).is_integer() and a_alpha <= _EXACT_LOSS_MAX_ALPHA:
+        expected_loss = expected_loss_beta(a_alpha, a_beta, b_alpha, b_beta)
+    else:
+        np.negative(absolute_diff, out=absolute_diff)
+        expected_loss = np.maximum(absolute_diff, 0, out=absolute_diff).mean()
     
     return {
         'a_conversion': a_successes / a_total,
         'b_conversion': b_successes / b_total,
         'mean_uplift': mean_uplift,
-        'ci_lower': ci[0],
-        'ci_upper': ci[1],
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
         'ci_width': ci_width,
         'abs_mean': abs_mean,
-        'abs_ci_lower': abs_ci[0],
-        'abs_ci_upper': abs_ci[1],
+        'abs_ci_lower': abs_ci_lower * 100,
+        'abs_ci_upper': abs_ci_upper * 100,
         'prob_b_better': prob_b_better,
         'expected_loss': expected_loss,
         'a_samples': a_samples,
@@ -109,9 +244,69 @@ def run_simulation(a_successes: int, a_total: int,
     }
 
 
+class _BayesianSampler:
+    """
+    Posterior sampler that reuses its buffers across draws of a fixed size.
+    
+    Beta variates are generated as a ratio of Gamma variates written straight
+    into preallocated arrays, so repeated draws do not allocate. The buffers
+    are overwritten on every call; use run_simulation for samples that need
+    to outlive the next draw. Like run_simulation, it works in single
+    precision.
+    
+    Args:
+        n: Number of Monte Carlo simulations per draw
+    """
+    
+    def __init__(self, n: int):
+        self.a = np.empty(n, dtype=np.float32)
+        self.b = np.empty(n, dtype=np.float32)
+        self.diff = np.empty(n, dtype=np.float32)
+    
+    def _draw_beta(self, alpha: float, beta: float,
+                   rng: np.random.Generator, out: np.ndarray) -> None:
+        """Fill out with Beta(alpha, beta) variates, using diff as scratch"""
+        rng.standard_gamma(alpha, dtype=np.float32, out=out)
+        rng.standard_gamma(beta, dtype=np.float32, out=self.diff)
+        np.add(out, self.diff, out=self.diff)
+        np.divide(out, self.diff, out=out)
+    
+    def ci_width(self, a_alpha: float, a_beta: float,
+                 b_alpha: float, b_beta: float,
+                 rng: np.random.Generator) -> float:
+        """
+        Estimate only the width of the 95% credible interval of the relative uplift.
+        
+        A stripped-down version of run_simulation for the sample size search,
+        which only needs the interval width.
+        
+        Args:
+            a_alpha: Alpha parameter of the posterior for group A
+            a_beta: Beta parameter of the posterior for group A
+            b_alpha: Alpha parameter of the posterior for group B
+            b_beta: Beta parameter of the posterior for group B
+            rng: Random generator to draw from
+            
+        Returns:
+            Width of the relative uplift credible interval in percentage points
+        """
+        self._draw_beta(a_alpha, a_beta, rng, self.a)
+        self._draw_beta(b_alpha, b_beta, rng, self.b)
+        _guard_small_alpha(a_alpha, self.a, "sample size check")
+        
+        np.subtract(self.b, self.a, out=self.diff)
+        np.divide(self.diff, self.a, out=self.diff)
+        lo, hi = _credible_interval(self.diff, in_place=True)
+        return (hi - lo) * 100
+
+
 def calculate_additional_sample_size(a_successes: int, a_total: int, 
                                b_successes: int, b_total: int, 
-                               target_width: float = 5.0) -> Dict:
+                               target_width: float = 5.0,
+                               alpha_prior: float = 1,
+                               beta_prior: float = 1,
+                               rng: Optional[np.random.Generator] = None,
+                               initial_results: Optional[Dict] = None) -> Dict:
     """
     Estimate additional sample size needed to achieve target CI width.
     
@@ -121,16 +316,29 @@ def calculate_additional_sample_size(a_successes: int, a_total: int,
         b_successes: Number of successes in group B
         b_total: Total number of trials in group B
         target_width: Target width of credible interval in percentage points
+        alpha_prior: Alpha parameter for Beta prior
+        beta_prior: Beta parameter for Beta prior
+        rng: Random generator shared by every simulation in the search. Passing
+            a seeded generator makes the estimated widths reproducible.
+        initial_results: Results of run_simulation on the current data, to
+            reuse instead of simulating them again. They must use the same
+            priors, and their current width drives the scaling factor, so
+            results from a small number of simulations make it noisy.
         
     Returns:
         Dictionary with sample size estimates
     """
+    if rng is None:
+        rng = np.random.default_rng()
+    
     # Current conversion rates
     a_rate = a_successes / a_total
     b_rate = b_successes / b_total
     
-    # Run initial simulation to get current width
-    initial_results = run_simulation(a_successes, a_total, b_successes, b_total)
+    # Run initial simulation to get current width, unless already available
+    if initial_results is None:
+        initial_results = run_simulation(a_successes, a_total, b_successes, b_total,
+                                         alpha_prior=alpha_prior, beta_prior=beta_prior, rng=rng)
     current_width = initial_results['ci_width']
     
     if current_width <= target_width:
@@ -145,60 +353,45 @@ def calculate_additional_sample_size(a_successes: int, a_total: int,
     # Calculate scaling factor (inverse square relationship between width and sample size)
     scaling_factor = (current_width / target_width) ** 2
     
-    # Estimate additional samples needed
-    additional_a = math.ceil((scaling_factor - 1) * a_total)
-    additional_b = math.ceil((scaling_factor - 1) * b_total)
+    # Function to test a specific sample size. Every test replays the same
+    # random stream (common random numbers), so the first and the rescaled
+    # test differ only in sample size. Each test is still compared with the
+    # target on its own, so it keeps the full number of simulations.
+    sampler = _BayesianSampler(100_000)
+    seed_sequence = np.random.SeedSequence(rng.integers(2**63))
     
-    # Function to test a specific sample size
     def test_width(additional_a, additional_b):
         # Calculate new successes based on current rates
         new_a_successes = round(a_rate * additional_a)
         new_b_successes = round(b_rate * additional_b)
         
-        # Run simulation with combined samples
-        test_results = run_simulation(
-            a_successes + new_a_successes,
-            a_total + additional_a,
-            b_successes + new_b_successes,
-            b_total + additional_b,
-            50000  # Smaller simulation for faster iteration
-        )
+        # Posterior parameters for the combined samples
+        a_alpha, a_beta = _posterior_parameters(a_successes + new_a_successes, a_total + additional_a,
+                                                alpha_prior, beta_prior)
+        b_alpha, b_beta = _posterior_parameters(b_successes + new_b_successes, b_total + additional_b,
+                                                alpha_prior, beta_prior)
         
-        return test_results['ci_width']
-    
-    # Binary search to refine the estimate
-    low_factor = 0.7  # Start at 70% of the initial estimate
-    high_factor = 1.3  # Go up to 130% of the initial estimate
-    
-    best_additional_a = additional_a
-    best_additional_b = additional_b
-    best_width = test_width(additional_a, additional_b)
-    
-    # If our initial estimate is too small
-    if best_width > target_width:
-        high_factor = 2.0  # Try up to double
-    
-    # Binary search for the optimal sample size
-    for _ in range(5):  # Limited iterations for performance
-        mid_factor = (low_factor + high_factor) / 2
-        mid_additional_a = math.ceil(mid_factor * additional_a)
-        mid_additional_b = math.ceil(mid_factor * additional_b)
-        
-        width = test_width(mid_additional_a, mid_additional_b)
-        
-        if width < best_width and abs(width - target_width) < abs(best_width - target_width):
-            best_width = width
-            best_additional_a = mid_additional_a
-            best_additional_b = mid_additional_b
-        
-        if width > target_width:
-            low_factor = mid_factor
-        else:
-            high_factor = mid_factor
-    
-    # Ensure we're rounding to sensible numbers
-    best_additional_a = math.ceil(best_additional_a / 10) * 10
-    best_additional_b = math.ceil(best_additional_b / 10) * 10
+        return sampler.ci_width(a_alpha, a_beta, b_alpha, b_beta,
+                                np.random.default_rng(seed_sequence))
+    
+    # Function to size both groups for a given scaling factor, rounded up to
+    # sensible numbers
+    def additional_for(scaling_factor):
+        additional_a = math.ceil((scaling_factor - 1) * a_total / 10) * 10
+        additional_b = math.ceil((scaling_factor - 1) * b_total / 10) * 10
+        return additional_a, additional_b
+    
+    # The width scaling law is exact up to Monte Carlo noise, so a single
+    # simulation verifies the estimate; only a clear miss is rescaled once
+    best_additional_a, best_additional_b = additional_for(scaling_factor)
+    best_width = test_width(best_additional_a, best_additional_b)
+    
+    if best_width > target_width * 1.05:
+        # Capped at doubling, since the law can fail badly (e.g. when A has no
+        # successes the width grows with the sample size)
+        scaling_factor *= min((best_width / target_width) ** 2, 2.0)
+        best_additional_a, best_additional_b = additional_for(scaling_factor)
+        best_width = test_width(best_additional_a, best_additional_b)
     
     return {
         'additional_samples_needed_a': best_additional_a,
@@ -213,7 +406,7 @@ def calculate_additional_sample_size(a_successes: int, a_total: int,
 # VISUALIZATION FUNCTIONS
 # ============================================================
 
-def create_posterior_distribution_plot(results: Dict) -> Figure:
+def create_posterior_distribution_plot(results: Dict) -> "Figure":
     """
     Create a plot of the posterior distributions for A and B.
     
@@ -223,11 +416,17 @@ def create_posterior_distribution_plot(results: Dict) -> Figure:
     Returns:
         Matplotlib figure
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    import matplotlib.pyplot as plt
     
-    # Plot histograms
-    ax.hist(results['a_samples'], bins=50, alpha=0.5, label=f'Group A: {results["a_conversion"]:.2%}')
-    ax.hist(results['b_samples'], bins=50, alpha=0.5, label=f'Group B: {results["b_conversion"]:.2%}')
+    fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
+    
+    # Plot histograms as step outlines, binned on shared edges so the two
+    # groups line up and stay readable where they overlap
+    edges = np.histogram_bin_edges(np.concatenate([results['a_samples'], results['b_samples']]), bins=50)
+    a_counts, _ = np.histogram(results['a_samples'], bins=edges)
+    b_counts, _ = np.histogram(results['b_samples'], bins=edges)
+    ax.stairs(a_counts, edges, linewidth=1.5, color='C0', rasterized=True, label=f'Group A: {results["a_conversion"]:.2%}')
+    ax.stairs(b_counts, edges, linewidth=1.5, color='C1', rasterized=True, label=f'Group B: {results["b_conversion"]:.2%}')
     
     # Add vertical lines for means
     ax.axvline(np.mean(results['a_samples']), color='blue', linestyle='--', alpha=0.7)
@@ -239,10 +438,9 @@ def create_posterior_distribution_plot(results: Dict) -> Figure:
     ax.legend()
     ax.grid(alpha=0.3)
     
-    plt.tight_layout()
     return fig
 
-def create_uplift_distribution_plot(results: Dict) -> Figure:
+def create_uplift_distribution_plot(results: Dict) -> "Figure":
     """
     Create a plot of the uplift distribution with CI.
     
@@ -252,11 +450,13 @@ def create_uplift_distribution_plot(results: Dict) -> Figure:
     Returns:
         Matplotlib figure
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    import matplotlib.pyplot as plt
+    
+    fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
     
-    # Plot uplift histogram
-    uplift_pct = results['relative_uplift'] * 100
-    ax.hist(uplift_pct, bins=50, alpha=0.6, color='green')
+    # Plot uplift histogram, scaling the bin edges to percent rather than the samples
+    counts, edges = np.histogram(results['relative_uplift'], bins=50)
+    ax.stairs(counts, edges * 100, fill=True, alpha=0.6, color='green', rasterized=True)
     
     # Add vertical lines for mean and CI
     ax.axvline(results['mean_uplift'], color='green', linestyle='-', linewidth=2, label=f'Mean: {results["mean_uplift"]:.2f}%')
@@ -276,10 +476,9 @@ def create_uplift_distribution_plot(results: Dict) -> Figure:
     ax.legend()
     ax.grid(alpha=0.3)
     
-    plt.tight_layout()
     return fig
 
-def create_interval_width_comparison_plot(results: Dict, sample_estimate: Dict, target_width: float) -> Figure:
+def create_interval_width_comparison_plot(results: Dict, sample_estimate: Dict, target_width: float) -> "Figure":
     """
     Create a plot comparing the current interval width and estimated width after collecting more samples.
     
@@ -291,7 +490,9 @@ def create_interval_width_comparison_plot(results: Dict, sample_estimate: Dict,
     Returns:
         Matplotlib figure
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    import matplotlib.pyplot as plt
+    
+    fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
     
     widths = [results['ci_width'], sample_estimate['estimated_final_width'], target_width]
     labels = ['Current Width', 'Estimated Width\nAfter Additional Samples', 'Target Width']
@@ -310,7 +511,6 @@ def create_interval_width_comparison_plot(results: Dict, sample_estimate: Dict,
     ax.set_ylabel('Width (%)')
     ax.grid(axis='y', alpha=0.3)
     
-    plt.tight_layout()
     return fig
 
 def save_all_plots(results: Dict, sample_estimate: Dict, target_width: float) -> None:
@@ -322,10 +522,7 @@ def save_all_plots(results: Dict, sample_estimate: Dict, target_width: float) ->
         sample_estimate: Dictionary with sample size estimation results
         target_width: Target width of credible interval
     """
-    import os
-    
-    # Get the directory of the current script file
-    script_dir = os.path.dirname(os.path.abspath(__file__))
+    import matplotlib.pyplot as plt
     
     # Create plots
     # posterior_fig = create_posterior_distribution_plot(results)
@@ -333,12 +530,13 @@ def save_all_plots(results: Dict, sample_estimate: Dict, target_width: float) ->
     # width_fig = create_interval_width_comparison_plot(results, sample_estimate, target_width)
     
     # Save plots to the script directory
-    posterior_path = os.path.join(script_dir, 'posterior_distributions.png')
-    uplift_path = os.path.join(script_dir, 'uplift_distribution.png')
-    width_path = os.path.join(script_dir, 'interval_width_comparison.png')
+    posterior_path = os.path.join(_SCRIPT_DIR, 'posterior_distributions.png')
+    uplift_path = os.path.join(_SCRIPT_DIR, 'uplift_distribution.png')
+    width_path = os.path.join(_SCRIPT_DIR, 'interval_width_comparison.png')
     
     # posterior_fig.savefig(posterior_path)
-    uplift_fig.savefig(uplift_path)
+    # A low DPI and light PNG compression keep encoding fast for these simple plots
+    uplift_fig.savefig(uplift_path, dpi=80, pil_kwargs={'compress_level': 1})
     # width_fig.savefig(width_path)
     
     plt.close('all')
@@ -400,6 +598,10 @@ def parse_arguments():
                         help=f'Target width of credible interval in % (default: {TARGET_WIDTH})')
     parser.add_argument('--simulations', type=int, default=N_SIMULATIONS,
                         help=f'Number of Monte Carlo simulations (default: {N_SIMULATIONS})')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for reproducible simulations (default: none)')
+    parser.add_argument('--verify', action='store_true',
+                        help='Always verify the recommended sample size with a full simulation')
     parser.add_argument('--no-plots', action='store_true',
                         help='Disable plot generation')
     
@@ -417,6 +619,7 @@ def main():
     target_width = args.target_width
     n_simulations = args.simulations
     generate_plots = GENERATE_PLOTS and not args.no_plots
+    rng = np.random.default_rng(args.seed)
     
     # Print input data
     print_section_header("INPUT DATA")
@@ -429,7 +632,7 @@ def main():
     results = run_simulation(
         a_successes, a_total, 
         b_successes, b_total, 
-        n_simulations, ALPHA_PRIOR, BETA_PRIOR
+        n_simulations, ALPHA_PRIOR, BETA_PRIOR, rng
     )
     
     # Print simulation results
@@ -438,14 +641,19 @@ def main():
     
     # Calculate and print sample size needed
     sample_estimate = calculate_additional_sample_size(
-        a_successes, a_total, b_successes, b_total, target_width
+        a_successes, a_total, b_successes, b_total, target_width,
+        ALPHA_PRIOR, BETA_PRIOR, rng, initial_results=results
     )
     
     print_section_header("SAMPLE SIZE ESTIMATION")
     print_sample_size_results(sample_estimate, target_width)
     
-    # Optional: Verify with a full simulation using the recommended total sample sizes
-    if sample_estimate['additional_samples_needed_a'] > 0:
+    # Optional: Verify with a full simulation using the recommended total sample sizes.
+    # The estimated width already comes from a full simulation at these totals,
+    # so this repeats it only when the estimate fell outside the band the
+    # sample size estimate accepts, or when explicitly requested.
+    estimate_on_target = sample_estimate['estimated_final_width'] <= target_width * 1.05
+    if sample_estimate['additional_samples_needed_a'] > 0 and (args.verify or not estimate_on_target):
         print_section_header("VERIFICATION WITH INCREASED SAMPLE SIZE")
         new_a_successes = round(results['a_conversion'] * sample_estimate['additional_samples_needed_a'])
         new_b_successes = round(results['b_conversion'] * sample_estimate['additional_samples_needed_b'])
@@ -455,7 +663,8 @@ def main():
             a_total + sample_estimate['additional_samples_needed_a'],
             b_successes + new_b_successes, 
             b_total + sample_estimate['additional_samples_needed_b'],
-            n_simulations
+            n_simulations, ALPHA_PRIOR, BETA_PRIOR,
+            rng=rng
         )
         
         print(f"Verified CI Width: {verification['ci_width']:.2f}%")
@@ -468,9 +677,7 @@ def main():
         print("Generating plots...")
         try:
             save_all_plots(results, sample_estimate, target_width)
-            # Get the directory of the current script file for display purposes
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            print(f"Plots saved to: {script_dir}")
+            print(f"Plots saved to: {_SCRIPT_DIR}")
             # print("- posterior_distributions.png")
             print("- uplift_distribution.png")
             # print("- interval_width_comparison.png")